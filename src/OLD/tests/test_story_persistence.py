@@ -2,35 +2,53 @@
 """Test story state persistence across MCP server calls."""
 
 import asyncio
+import os
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+
+def wiki_tools_connection():
+    """MCP connection config: SSE to WIKI_TOOLS_URL if set, else a stdio child process.
+    
+    A warm server keeps its story position between runs, so restart it before
+    relying on the word-100/200/300 check.
+    """
+    url = os.environ.get("WIKI_TOOLS_URL")  # e.g. http://127.0.0.1:8765/sse
+    if url:
+        return {"url": url, "transport": "sse"}
+    return {
+        "command": ".venv/bin/python",
+        "args": ["src/OLD/tools.py"],
+        "transport": "stdio"
+    }
+
 
 async def test_story_persistence():
     """Test if story state persists across multiple tool calls."""
     print("🔍 Testing story state persistence...")
     
-    # Setup MCP client
-    mcp_client = MultiServerMCPClient({
-        "wiki_tools": {
-            "command": ".venv/bin/python",
-            "args": ["src/tools.py"],
-            "transport": "stdio"
-        }
-    })
-    
-    tools = await mcp_client.get_tools()
-    advance_tool = next(t for t in tools if t.name == "advance")
-    
-    print("\n🚀 Call 1: advance(100)")
-    result1 = await advance_tool.ainvoke({"num_words": 100})
-    print(f"Result 1: {result1[:100]}...")
-    
-    print("\n🚀 Call 2: advance(100) - should continue from word 100")
-    result2 = await advance_tool.ainvoke({"num_words": 100}) 
-    print(f"Result 2: {result2[:100]}...")
+    # Setup MCP client - reuse a warm server if one is running
+    # (start it with: python src/OLD/tools.py --sse 8765), else spawn one over stdio
+    mcp_client = MultiServerMCPClient({"wiki_tools": wiki_tools_connection()})
     
-    print("\n🚀 Call 3: advance(100) - should continue from word 200")
-    result3 = await advance_tool.ainvoke({"num_words": 100})
-    print(f"Result 3: {result3[:100]}...")
+    # Hold one session open for all calls: tools from get_tools() start a fresh
+    # stdio server process per invocation, which both costs a cold start per call
+    # and throws away the story state this test is checking.
+    async with mcp_client.session("wiki_tools") as session:
+        tools = await load_mcp_tools(session)
+        advance_tool = next(t for t in tools if t.name == "advance")
+        
+        # Sequential on purpose - each call must continue from the previous position
+        print("\n🚀 Call 1: advance(100)")
+        result1 = await advance_tool.ainvoke({"num_words": 100})
+        print(f"Result 1: {result1[:100]}...")
+        
+        print("\n🚀 Call 2: advance(100) - should continue from word 100")
+        result2 = await advance_tool.ainvoke({"num_words": 100}) 
+        print(f"Result 2: {result2[:100]}...")
+        
+        print("\n🚀 Call 3: advance(100) - should continue from word 200")
+        result3 = await advance_tool.ainvoke({"num_words": 100})
+        print(f"Result 3: {result3[:100]}...")
     
     # Check if positions are advancing
     if "word 100" in result1 and "word 200" in result2 and "word 300" in result3:
@@ -715,5 +715,17 @@ if __name__ == "__main__":
     import sys
     print("🚀 MCP Server Starting - Tool logging enabled", file=sys.stderr, flush=True)
     
-    # Run the MCP server with suppressed banner
-    mcp.run(transport="stdio", show_banner=False)
+    # Run the MCP server with suppressed banner. Pass --sse [PORT] to keep a
+    # long-lived server up for repeated test runs instead of a stdio child per run.
+    import argparse
+    parser = argparse.ArgumentParser(description="MechaWiki MCP tools server")
+    parser.add_argument(
+        "--sse", nargs="?", type=int, const=8765, metavar="PORT",
+        help="serve over SSE on 127.0.0.1:PORT (default 8765) instead of stdio",
+    )
+    cli_args = parser.parse_args()
+    
+    if cli_args.sse is not None:
+        mcp.run(transport="sse", host="127.0.0.1", port=cli_args.sse, show_banner=False)
+    else:
+        mcp.run(transport="stdio", show_banner=False)
@@ -62,22 +62,7 @@ class WriterAgent(BaseAgent):
         logger.info(f"✍️ WriterAgent initialized: story_file={story_file}, agent_id={agent_id}")
         # Load system prompt from files if not provided
         if system_prompt is None:
-            base_prompt = build_agent_prompt("writer", include_tools=True)
-            # Add story file context
-            system_prompt = f"""{base_prompt}
-
----
-
-## Your Story File
-
-**Your designated output file:** `{story_file}`
-
-When you write new narrative content, use:
-```
-add_to_my_story(content="your prose here")
-```
-
-All your creative story writing will be appended to this file. This is where your narrative output lives!"""
+            system_prompt = self._build_story_prompt(story_file)
         
         # Initialize base agent
         super().__init__(
@@ -168,7 +153,10 @@ All your creative story writing will be appended to this file. This is where you
         }
         self.tools.append(edit_file_def)
         
-        # add_to_my_story - bound version of add_to_story for this agent
+        self._add_my_story_tool()
+    
+    def _add_my_story_tool(self):
+        """Add add_to_my_story - bound version of add_to_story for this agent."""
         def add_to_my_story(content: str):
             """
             Append narrative prose to YOUR story file.
@@ -252,6 +240,29 @@ All your creative story writing will be appended to this file. This is where you
         # self.tools.append(create_image_def)
         pass
     
+    @staticmethod
+    def _build_story_prompt(story_file: str) -> str:
+        """Build the writer system prompt pointing at ``story_file``."""
+        base_prompt = build_agent_prompt("writer", include_tools=True)
+        return f"""{base_prompt}
+
+---
+
+## Your Story File
+
+**Your designated output file:** `{story_file}`
+
+When you write new narrative content, use:
+```
+add_to_my_story(content="your prose here")
+```
+
+All your creative story writing will be appended to this file. This is where your narrative output lives!"""
+    
+    def _rebuild_system_prompt(self):
+        """Regenerate the system prompt for the current story_file."""
+        self.system_prompt = self._enhance_system_prompt(self._build_story_prompt(self.story_file))
+    
     def _rename_my_story_impl(self, new_filename: str) -> dict:
         """
         Implementation of rename_my_story tool.
@@ -292,21 +303,7 @@ All your creative story writing will be appended to this file. This is where you
                     )
                     
                     # Regenerate system prompt with new file path
-                    base_prompt = build_agent_prompt("writer", include_tools=True)
-                    self.system_prompt = f"""{base_prompt}
-
----
-
-## Your Story File
-
-**Your designated output file:** `{new_filepath}`
-
-When you write new narrative content, use:
-```
-add_to_my_story(content="your prose here")
-```
-
-All your creative story writing will be appended to this file. This is where your narrative output lives!"""
+                    self._rebuild_system_prompt()
                     
                 except Exception as e:
                     # If we can't update agents.json, at least we renamed the file
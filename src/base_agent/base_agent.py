@@ -77,7 +77,9 @@ class BaseAgent:
         # Add the built-in report_issue() tool
         self._add_report_issue_tool()
         
-        # Enhance system prompt with auto-generated tool descriptions
+        # Enhance system prompt with auto-generated tool descriptions. The block is
+        # kept so subclasses that rebuild their prompt later append the same one.
+        self._tools_description = self._generate_tools_description()
         self.system_prompt = self._enhance_system_prompt(system_prompt)
         
         logger.debug(f"🤖 BaseAgent initialized: model={model}, stream={stream}, tools={len(self.tools)}")
@@ -338,8 +340,8 @@ class BaseAgent:
         return "\n".join(descriptions)
     
     def _enhance_system_prompt(self, base_prompt: str) -> str:
-        """Enhance system prompt with auto-generated tool descriptions."""
-        tools_desc = self._generate_tools_description()
+        """Enhance system prompt with the tool descriptions generated at init."""
+        tools_desc = self._tools_description
         
         # # If the prompt already contains "Available tools:", replace that section
         # if "Available tools:" in base_prompt:
@@ -424,8 +426,9 @@ class BaseAgent:
         Returns:
             Tuple of (collected_content, collected_thinking, tool_calls, usage_info)
         """
-        collected_content = ""
-        collected_thinking = ""
+        # Collect text as parts and join once at the end - repeated str += is O(n²)
+        content_parts = []
+        thinking_parts = []
         tool_calls = []
         thinking_active = False
         usage_info = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
@@ -438,7 +441,7 @@ class BaseAgent:
                     yield {'type': 'thinking_start'}
                     thinking_active = True
                 yield {'type': 'thinking_token', 'content': thinking_content}
-                collected_thinking += thinking_content
+                thinking_parts.append(thinking_content)
                 continue  # Don't process as regular content
             
             # Regular content
@@ -450,7 +453,7 @@ class BaseAgent:
                 
                 content = chunk.choices[0].delta.content
                 yield {'type': 'text_token', 'content': content}
-                collected_content += content
+                content_parts.append(content)
             
             # Handle tool calls (fully formed from litellm)
             if hasattr(chunk.choices[0].delta, 'tool_calls') and chunk.choices[0].delta.tool_calls:
@@ -485,7 +488,7 @@ class BaseAgent:
         if thinking_active:
             yield {'type': 'thinking_end'}
         
-        return collected_content, collected_thinking, tool_calls, usage_info
+        return "".join(content_parts), "".join(thinking_parts), tool_calls, usage_info
     
     def _extract_thinking_from_chunk(self, chunk) -> Optional[str]:
         """
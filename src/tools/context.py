@@ -4,7 +4,9 @@ Context retrieval tool using memtool for multi-document expansion.
 This tool provides intelligent context retrieval that automatically includes
 related documents based on git history, markdown links, and semantic relationships.
 """
+import asyncio
 import os
+import threading
 from pathlib import Path
 from typing import Optional, Literal, Dict, Any, List
 import logging
@@ -13,27 +15,38 @@ logger = logging.getLogger(__name__)
 
 # Lazy import - only load when tool is actually used
 _memtool_client = None
+_memtool_client_lock = threading.Lock()
 
 
 def _get_memtool_client():
-    """Get or create memtool client singleton."""
-    global _memtool_client
+    """
+    Get or create memtool client singleton.
     
-    if _memtool_client is None:
-        try:
-            from memtool.client import MemtoolClient
-            _memtool_client = MemtoolClient(port=18861)
-            logger.info("✓ Connected to memtool server on port 18861")
-        except Exception as e:
-            logger.error(f"Failed to connect to memtool server: {e}")
-            raise ConnectionError(
-                "memtool server not running. Start with: memtool server start --port 18861"
-            )
+    Uses double-checked locking so concurrent callers (agent threads,
+    parallel test workers) construct exactly one client.
+    """
+    global _memtool_client
     
-    return _memtool_client
+    client = _memtool_client
+    if client is None:
+        with _memtool_client_lock:
+            client = _memtool_client
+            if client is None:
+                try:
+                    from memtool.client import MemtoolClient
+                    _memtool_client = client = MemtoolClient(port=18861)
+                    logger.info("✓ Connected to memtool server on port 18861")
+                except Exception as e:
+                    logger.error(f"Failed to connect to memtool server: {e}")
+                    raise ConnectionError(
+                        "memtool server not running. Start with: memtool server start --port 18861"
+                    )
+    
+    return client
 
 
 _index_ensured = False  # Track if we've already ensured index for this client
+_index_lock = threading.Lock()
 
 def _ensure_index_loaded():
     """
@@ -44,61 +57,64 @@ def _ensure_index_loaded():
     This function uses the singleton client and only checks once.
     """
     global _index_ensured
-    import os
     import toml
-    from pathlib import Path
     
     # Already checked in this process
     if _index_ensured:
         return
     
-    client = _get_memtool_client()  # Use the singleton
-    
-    # Check if index is already loaded ON THIS CLIENT
-    try:
-        status = client.status()
-        if status['loaded']:
-            _index_ensured = True
-            return  # All good!
-    except Exception as e:
-        logger.warning(f"Could not check server status: {e}")
-    
-    # Index not loaded - need to load it
-    logger.warning("⚠️  memtool index not loaded on this client, loading...")
-    
-    # Get wikicontent path from config
-    try:
-        config_path = Path(__file__).parent.parent.parent / "config.toml"
-        config = toml.load(config_path)
-        content_repo = Path(config['paths']['content_repo'])
-    except Exception as e:
-        logger.error(f"Could not load config: {e}")
-        raise ConnectionError("Could not determine wikicontent path from config.toml")
-    
-    # memtool server doesn't care about our local cwd, so use absolute paths
-    cache_path = str(content_repo / ".memtool_index.json")
-    
-    # Try to load cached index first
-    if Path(cache_path).exists():
-        try:
-            logger.info("   Loading index from cache...")
-            result = client.load_index(cache_path)
-            logger.info(f"✓ Index loaded: {result['summary']['num_files']} files")
-            _index_ensured = True
+    with _index_lock:
+        # Another thread may have loaded the index while we waited
+        if _index_ensured:
             return
+        
+        client = _get_memtool_client()  # Use the singleton
+        
+        # Check if index is already loaded ON THIS CLIENT
+        try:
+            status = client.status()
+            if status['loaded']:
+                _index_ensured = True
+                return  # All good!
         except Exception as e:
-            logger.warning(f"   Failed to load cached index: {e}")
-    
-    # Build fresh index - use absolute path!
-    logger.info(f"   Building fresh index from: {content_repo}")
-    result = client.build_index(str(content_repo))
-    summary = result['summary']
-    logger.info(f"✓ Index built: {summary['num_files']} files, {summary['num_intervals']} intervals")
-    
-    # Save for next time
-    client.save_index(cache_path)
-    logger.info("✓ Index saved to cache")
-    _index_ensured = True
+            logger.warning(f"Could not check server status: {e}")
+        
+        # Index not loaded - need to load it
+        logger.warning("⚠️  memtool index not loaded on this client, loading...")
+        
+        # Get wikicontent path from config
+        try:
+            config_path = Path(__file__).parent.parent.parent / "config.toml"
+            config = toml.load(config_path)
+            content_repo = Path(config['paths']['content_repo'])
+        except Exception as e:
+            logger.error(f"Could not load config: {e}")
+            raise ConnectionError("Could not determine wikicontent path from config.toml")
+        
+        # memtool server doesn't care about our local cwd, so use absolute paths
+        cache_path = str(content_repo / ".memtool_index.json")
+        
+        # Try to load cached index first
+        if Path(cache_path).exists():
+            try:
+                logger.info("   Loading index from cache...")
+                result = client.load_index(cache_path)
+                logger.info(f"✓ Index loaded: {result['summary']['num_files']} files")
+                _index_ensured = True
+                return
+            except Exception as e:
+                logger.warning(f"   Failed to load cached index: {e}")
+        
+        # Build fresh index - use absolute path!
+        logger.info(f"   Building fresh index from: {content_repo}")
+        result = client.build_index(str(content_repo))
+        summary = result['summary']
+        logger.info(f"✓ Index built: {summary['num_files']} files, {summary['num_intervals']} intervals")
+        
+        # Save for next time
+        client.save_index(cache_path)
+        logger.info("✓ Index saved to cache")
+        _index_ensured = True
 
 
 def get_context(
@@ -261,17 +277,18 @@ def get_context(
     find_articles : Search for articles by name
     """
     try:
-        # Ensure index is loaded (self-healing)
-        _ensure_index_loaded()
-        
-        client = _get_memtool_client()
-        
         # Type coercion: LLMs often pass numbers as strings
-        # memtool expects ints, so convert them
+        # memtool expects ints, so convert them up front - bad input
+        # fails here without costing a server roundtrip
         start_line = int(start_line)
         end_line = int(end_line)
         padding = int(padding)
         
+        # Ensure index is loaded (self-healing)
+        _ensure_index_loaded()
+        
+        client = _get_memtool_client()
+        
         # Step 1: Get context intervals (discovers related documents)
         logger.debug(f"Querying context for {document} lines {start_line}-{end_line}")
         context = client.get_context(document, start_line, end_line)
@@ -340,14 +357,50 @@ def get_context(
             return f"Error: {error_msg}"
 
 
+async def aget_context(
+    document: str,
+    start_line: int = 1,
+    end_line: int = 999999,
+    expansion_mode: Literal["paragraph", "line", "section"] = "paragraph",
+    padding: int = 2,
+    return_metadata: bool = False
+) -> str | Dict[str, Any]:
+    """
+    Async variant of get_context() for fanning out several queries at once.
+    
+    Each call runs get_context() in a worker thread, so independent queries
+    overlap their memtool roundtrips instead of waiting on each other. All
+    calls share the singleton memtool client.
+    
+    See get_context() for parameters and return values.
+    
+    Examples
+    --------
+    >>> results = await asyncio.gather(
+    ...     aget_context("articles/dracula.md"),
+    ...     aget_context("articles/castle.md"),
+    ... )
+    """
+    return await asyncio.to_thread(
+        get_context,
+        document,
+        start_line=start_line,
+        end_line=end_line,
+        expansion_mode=expansion_mode,
+        padding=padding,
+        return_metadata=return_metadata
+    )
+
+
 def close_memtool_client():
     """Close the memtool client connection (called on shutdown)."""
     global _memtool_client
-    if _memtool_client is not None:
-        try:
-            _memtool_client.close()
-            logger.info("✓ Closed memtool client")
-        except Exception as e:
-            logger.warning(f"Error closing memtool client: {e}")
-        _memtool_client = None
+    with _memtool_client_lock:
+        if _memtool_client is not None:
+            try:
+                _memtool_client.close()
+                logger.info("✓ Closed memtool client")
+            except Exception as e:
+                logger.warning(f"Error closing memtool client: {e}")
+            _memtool_client = None
 
@@ -10,6 +10,9 @@ from typing import Dict, Any, Optional
 import re
 from .git_helper import commit_file_change, commit_file_rename
 
+# Aider-style search/replace block - captures everything between the markers
+_DIFF_BLOCK_PATTERN = re.compile(r'<<<<<<< SEARCH(.*?)=======(.*?)>>>>>>> REPLACE', re.DOTALL)
+
 
 def read_file(
     filepath: str,
@@ -61,10 +64,7 @@ def read_file(
         
         # Apply line range if specified
         if start_line is not None or end_line is not None:
-            lines = content.splitlines()
-            start_idx = (start_line - 1) if start_line else 0
-            end_idx = end_line if end_line else len(lines)
-            content = "\n".join(lines[start_idx:end_idx])
+            content = _slice_lines(content, start_line, end_line)
         
         return {"content": content}
     
@@ -340,6 +340,54 @@ def rename_story_file(old_filepath: str, new_filepath: str) -> Dict[str, Any]:
         }
 
 
+def _slice_lines(content: str, start_line: Optional[int], end_line: Optional[int]) -> str:
+    """
+    Return lines start_line..end_line (1-indexed, inclusive) joined by newlines.
+    
+    Walks newline offsets with str.find instead of splitting the whole file
+    into a list, so only the requested slice is copied.
+    """
+    start_idx = (start_line - 1) if start_line else 0
+    
+    # Negative indices count from the end - leave those to list slicing
+    if start_idx < 0 or (end_line is not None and end_line < 0):
+        lines = content.splitlines()
+        end_idx = end_line if end_line else len(lines)
+        return "\n".join(lines[start_idx:end_idx])
+    
+    # Skip to the first requested line
+    start_offset = 0
+    for _ in range(start_idx):
+        newline = content.find("\n", start_offset)
+        if newline == -1:
+            return ""
+        start_offset = newline + 1
+    
+    # Find the end of the last requested line
+    if end_line:
+        end_offset = start_offset
+        for _ in range(end_line - start_idx):
+            newline = content.find("\n", end_offset)
+            if newline == -1:
+                end_offset = len(content)
+                break
+            end_offset = newline + 1
+    else:
+        end_offset = len(content)
+    
+    selected = content[start_offset:end_offset]
+    return selected[:-1] if selected.endswith("\n") else selected
+
+
+def _parse_diff(diff: str) -> list[tuple[str, str]]:
+    """Parse an Aider-style diff into (search, replace) pairs."""
+    # Clean up the captured content (strip leading/trailing newlines and whitespace)
+    return [
+        (search.strip(), replace.strip())
+        for search, replace in _DIFF_BLOCK_PATTERN.findall(diff)
+    ]
+
+
 def _apply_diff(original_content: str, diff: str, file_exists: bool) -> tuple[str, Optional[str]]:
     """
     Apply Aider-style search/replace diff to content.
@@ -347,12 +395,7 @@ def _apply_diff(original_content: str, diff: str, file_exists: bool) -> tuple[st
     Returns (new_content, error_message).
     If error_message is not None, the operation failed.
     """
-    # Parse diff blocks - use simpler pattern that captures everything between markers
-    pattern = r'<<<<<<< SEARCH(.*?)=======(.*?)>>>>>>> REPLACE'
-    raw_matches = re.findall(pattern, diff, re.DOTALL)
-    
-    # Clean up the captured content (strip leading/trailing newlines and whitespace)
-    matches = [(search.strip(), replace.strip()) for search, replace in raw_matches]
+    matches = _parse_diff(diff)
     
     if not matches:
         return None, "Invalid diff format. Expected <<<<<<< SEARCH / ======= / >>>>>>> REPLACE blocks."
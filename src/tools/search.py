@@ -3,13 +3,27 @@ Search tools for finding files across the content repository.
 """
 import os
 import re
-import toml
 from pathlib import Path
 from typing import List
 
+try:
+    import tomllib  # Python 3.11+, C-accelerated
+except ModuleNotFoundError:
+    tomllib = None
+    import toml
+
+
+def _load_toml(path: str) -> dict:
+    """Parse a TOML file with stdlib tomllib when available, else the toml package."""
+    if tomllib is not None:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    return toml.load(path)
+
+
 # Load config once at module level
 try:
-    _config = toml.load("config.toml")
+    _config = _load_toml("config.toml")
     _content_repo_path = Path(_config["paths"]["content_repo"])
     _current_story = _config["story"]["current_story"]
     _articles_dir_name = _config["paths"]["articles_dir"]
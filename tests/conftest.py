@@ -0,0 +1,69 @@
+"""
+Shared pytest configuration for MechaWiki tests.
+
+src/ and the repo root are put on sys.path by ``pythonpath`` in pyproject.toml.
+"""
+import sys
+
+import pytest
+
+# Opt-in markers: tests carrying them are deselected unless their option is given.
+# Done in a collection hook rather than addopts, since any -m on the command line
+# replaces an addopts -m and would bring these tests back.
+OPT_IN_MARKERS = {
+    "live": "--run-live",
+    "integration": "--run-integration",
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-live", action="store_true", default=False,
+        help="run tests marked live (real network/API calls)",
+    )
+    parser.addoption(
+        "--run-integration", action="store_true", default=False,
+        help="run tests marked integration (start real agents against the real wikicontent)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Deselect opt-in tests whose option was not given, whatever -m says."""
+    skipped_markers = [
+        marker for marker, option in OPT_IN_MARKERS.items() if not config.getoption(option)
+    ]
+    if not skipped_markers:
+        return
+    
+    selected, deselected = [], []
+    for item in items:
+        if any(item.get_closest_marker(marker) for marker in skipped_markers):
+            deselected.append(item)
+        else:
+            selected.append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _litellm_quiet():
+    """Turn off litellm logging, callbacks and telemetry for the whole session.
+
+    Tests only need return values; this keeps per-call (and per-chunk, when
+    streaming) logging work and stray callback network calls out of the run.
+    Test modules are imported during collection, so litellm is only touched
+    when something collected actually uses it.
+    """
+    litellm = sys.modules.get("litellm")
+    if litellm is None:
+        yield
+        return
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(litellm, "set_verbose", False)
+        mp.setattr(litellm, "telemetry", False, raising=False)
+        mp.setattr(litellm, "success_callback", [])
+        mp.setattr(litellm, "failure_callback", [])
+        yield
+
@@ -0,0 +1,19 @@
+"""
+Plain helper functions shared by MechaWiki tests.
+
+Fixtures live in conftest.py; importable helpers live here, since pytest
+discourages importing conftest as a module.
+"""
+import os
+from pathlib import Path
+
+
+def touch_many(parent: Path, names: list[str]) -> None:
+    """Create empty files ``names`` under ``parent``.
+
+    Uses raw ``os.open``/``os.close`` rather than ``Path.write_text("")`` to skip
+    Python's buffered file object for fixtures that only need the file to exist.
+    """
+    for name in names:
+        fd = os.open(parent / name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.close(fd)
@@ -0,0 +1,51 @@
+"""
+Tests for AgentConfig reading agents.json (src/server/config.py).
+"""
+import json
+
+import pytest
+
+from server import config
+
+
+@pytest.fixture
+def agent_config(tmp_path, monkeypatch):
+    """An AgentConfig whose agents directory lives under tmp_path."""
+    agents_dir = tmp_path / "agents"
+    monkeypatch.setattr(config, "AGENTS_DIR", agents_dir)
+    monkeypatch.setattr(config, "AGENTS_FILE", agents_dir / "agents.json")
+    monkeypatch.setattr(config, "DEBUG_LOGS_DIR", agents_dir / "debug_logs")
+    monkeypatch.setattr(config, "COSTS_LOG", agents_dir / "costs.log")
+    return config.AgentConfig()
+
+
+def test_saved_changes_are_listed(agent_config):
+    """Agents added or updated through AgentConfig show up immediately."""
+    agent_config.add_agent({"id": "writer-001", "config": {}})
+    assert [a["id"] for a in agent_config.list_agents()] == ["writer-001"]
+
+    agent_config.update_agent("writer-001", {"config": {"story_file": "stories/new.md"}})
+
+    assert agent_config.get_agent("writer-001")["config"]["story_file"] == "stories/new.md"
+
+
+def test_external_edit_is_seen(agent_config):
+    """A hand edit to agents.json is picked up by the next list_agents()."""
+    assert agent_config.list_agents() == []
+
+    agent_config.agents_file.write_text(json.dumps({"agents": [{"id": "reader-001"}]}))
+
+    assert [a["id"] for a in agent_config.list_agents()] == ["reader-001"]
+
+
+def test_mutating_returned_agent_does_not_change_config(agent_config):
+    """Callers enrich returned dicts (e.g. with status); that must not leak back."""
+    agent_config.add_agent({"id": "writer-001", "config": {"story_file": "stories/a.md"}})
+
+    agent = agent_config.get_agent("writer-001")
+    agent["status"] = "running"
+    agent["config"]["story_file"] = "stories/b.md"
+
+    fresh = agent_config.get_agent("writer-001")
+    assert "status" not in fresh
+    assert fresh["config"]["story_file"] == "stories/a.md"
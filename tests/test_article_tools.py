@@ -5,8 +5,6 @@ import pytest
 import toml
 from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.tools import articles
 
@@ -1,9 +1,14 @@
 """
 Test litellm cost tracking to verify it works with our setup.
 """
+import os
+
 import litellm
 import pytest
 
+# Deselected unless --run-live is given (tests/conftest.py); skipped if there is no key
+requires_api_key = pytest.mark.skipif(not os.getenv("ANTHROPIC_API_KEY"), reason="no ANTHROPIC_API_KEY")
+
 
 def test_litellm_cost_calculation_with_mock_response():
     """Test that litellm.completion_cost() works with a mock response object."""
@@ -35,6 +40,8 @@ def test_litellm_cost_calculation_with_mock_response():
     assert cost < 0.01, "Cost for 150 tokens should be less than $0.01"
 
 
+@pytest.mark.live
+@requires_api_key
 def test_litellm_streaming_response_has_usage():
     """Test that streaming responses include usage info."""
     # Make a real streaming call (this will cost a tiny amount)
@@ -42,29 +49,28 @@ def test_litellm_streaming_response_has_usage():
         model="claude-haiku-4-5-20251001",
         messages=[{"role": "user", "content": "Say 'test' once."}],
         stream=True,
+        stream_options={"include_usage": True},
         temperature=1.0
     )
     
-    usage_found = False
-    usage_info = {}
-    
-    # Iterate through streaming chunks
+    # Iterate through streaming chunks - usage only arrives on the last one,
+    # so inspect it once after the loop instead of on every chunk
+    final_chunk = None
     for chunk in response:
         print(f"🔍 Chunk: {chunk}")
-        
-        # Check if this chunk has usage info
-        if hasattr(chunk, 'usage') and chunk.usage:
-            usage_found = True
-            usage_info = {
-                "prompt_tokens": getattr(chunk.usage, 'prompt_tokens', 0),
-                "completion_tokens": getattr(chunk.usage, 'completion_tokens', 0),
-                "total_tokens": getattr(chunk.usage, 'total_tokens', 0)
-            }
-            print(f"💰 Usage info found: {usage_info}")
-    
-    assert usage_found, "Usage info should be present in streaming response"
-    assert usage_info.get("prompt_tokens", 0) > 0, "Should have prompt tokens"
-    assert usage_info.get("completion_tokens", 0) > 0, "Should have completion tokens"
+        final_chunk = chunk
+    
+    usage = getattr(final_chunk, 'usage', None)
+    assert usage, "Usage info should be present in streaming response"
+    usage_info = {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens
+    }
+    print(f"💰 Usage info found: {usage_info}")
+    
+    assert usage_info["prompt_tokens"] > 0, "Should have prompt tokens"
+    assert usage_info["completion_tokens"] > 0, "Should have completion tokens"
     
     # Note: For streaming, we'd need to reconstruct a response object
     # But since we iterated through all chunks, we lost the original response
@@ -90,6 +96,8 @@ def test_litellm_streaming_response_has_usage():
     assert cost > 0, "Cost should be greater than 0"
 
 
+@pytest.mark.live
+@requires_api_key
 def test_litellm_non_streaming_response_has_usage():
     """Test that non-streaming responses include usage info."""
     # Make a real non-streaming call (this will cost a tiny amount)
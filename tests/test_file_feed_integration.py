@@ -12,10 +12,6 @@ import tempfile
 from pathlib import Path
 from datetime import datetime
 
-# Add parent to path for imports
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from src.tools.articles import write_article
 from src.tools.story import write_story, edit_story
 from src.server.log_watcher import LogManager
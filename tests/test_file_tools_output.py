@@ -7,9 +7,6 @@ import pytest
 import tempfile
 from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 
 class TestWriteArticleOutput:
     """Test write_article returns correct structure."""
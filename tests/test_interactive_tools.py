@@ -2,10 +2,7 @@
 Tests for interactive tools (src/tools/interactive.py).
 """
 import pytest
-from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.tools.interactive import wait_for_user, get_session_state, done, WaitingForInput, Finished
 
@@ -10,11 +10,6 @@ All three cases should be distinguishable!
 """
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from tools.context import get_context
 import tools.context
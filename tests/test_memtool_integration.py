@@ -9,15 +9,13 @@ These tests verify:
 5. Error handling for missing files and server issues
 """
 
+import asyncio
 import pytest
-import sys
 import os
-from pathlib import Path
+import threading
+from functools import lru_cache
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from tools.context import get_context, _get_memtool_client, _ensure_index_loaded
+from tools.context import get_context, aget_context, _get_memtool_client, _ensure_index_loaded
 import tools.context  # To reset module state between tests
 
 
@@ -28,16 +26,41 @@ def reset_module_state():
     tools.context._memtool_client = None
     tools.context._index_ensured = False
     yield
-    # Cleanup after test
-    if tools.context._memtool_client:
-        try:
-            tools.context._memtool_client.close()
-        except:
-            pass
-    tools.context._memtool_client = None
+    # Cleanup after test - no-op when the test never created a client
+    tools.context.close_memtool_client()
     tools.context._index_ensured = False
 
 
+@pytest.fixture(scope="session")
+def cached_get_context():
+    """
+    Memoized get_context() shared across the whole test session.
+    
+    get_context() is a pure function over the test corpus, so each unique
+    (document, start_line, end_line, expansion_mode, return_metadata) query
+    only needs one memtool roundtrip. Tests that verify singleton or
+    self-healing behavior must call get_context() directly instead.
+    """
+    @lru_cache(maxsize=128)
+    def _cached_get_context(
+        document,
+        start_line=1,
+        end_line=999999,
+        expansion_mode="paragraph",
+        return_metadata=False
+    ):
+        return get_context(
+            document,
+            start_line=start_line,
+            end_line=end_line,
+            expansion_mode=expansion_mode,
+            return_metadata=return_metadata
+        )
+    
+    return _cached_get_context
+
+
+@pytest.mark.slow_init
 class TestMemtoolSingletonClient:
     """Test that the client singleton pattern works correctly."""
     
@@ -48,6 +71,24 @@ class TestMemtoolSingletonClient:
         
         assert client1 is client2, "Should return same client instance"
     
+    @pytest.mark.thread_safety
+    def test_singleton_is_thread_safe(self):
+        """Verify concurrent callers all get the one client instance."""
+        clients = []
+        barrier = threading.Barrier(8)
+        
+        def grab_client():
+            barrier.wait()  # Release all threads at once to maximize contention
+            clients.append(_get_memtool_client())
+        
+        threads = [threading.Thread(target=grab_client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len({id(c) for c in clients}) == 1, "All threads should share one client"
+    
     def test_singleton_persists_across_get_context_calls(self):
         """Verify the same client is used across multiple get_context() calls."""
         # This is CRITICAL - if we create new clients, index is lost!
@@ -64,13 +105,12 @@ class TestMemtoolSingletonClient:
         assert tools.context._index_ensured, "Index should be marked as ensured"
 
 
+@pytest.mark.slow_init
 class TestIndexPersistence:
     """Test that the index persists correctly across operations."""
     
     def test_index_loads_once_and_persists(self):
         """Verify index is loaded once and persists for subsequent calls."""
-        from memtool.client import MemtoolClient
-        
         # First call - should load index
         result1 = get_context("articles/the-mist-keeper-universe.md", return_metadata=True)
         
@@ -100,16 +140,16 @@ class TestIndexPersistence:
 class TestGetContextTool:
     """Test the get_context() tool functionality."""
     
-    def test_get_context_returns_content(self):
+    def test_get_context_returns_content(self, cached_get_context):
         """Verify get_context returns content for existing files."""
-        result = get_context("articles/the-mist-keeper-universe.md")
+        result = cached_get_context("articles/the-mist-keeper-universe.md")
         
         assert isinstance(result, str), "Should return string"
         assert len(result) > 0, "Should return non-empty content"
     
-    def test_get_context_with_metadata(self):
+    def test_get_context_with_metadata(self, cached_get_context):
         """Verify metadata mode returns structured data."""
-        result = get_context("articles/the-mist-keeper-universe.md", return_metadata=True)
+        result = cached_get_context("articles/the-mist-keeper-universe.md", return_metadata=True)
         
         assert isinstance(result, dict), "Should return dict in metadata mode"
         assert 'content' in result, "Should have 'content' key"
@@ -120,9 +160,9 @@ class TestGetContextTool:
         assert isinstance(result['intervals'], list), "Intervals should be list"
         assert isinstance(result['num_docs'], int), "num_docs should be int"
     
-    def test_get_context_with_line_range(self):
+    def test_get_context_with_line_range(self, cached_get_context):
         """Verify line range filtering works."""
-        result = get_context(
+        result = cached_get_context(
             "articles/the-mist-keeper-universe.md",
             start_line=1,
             end_line=10,
@@ -140,12 +180,12 @@ class TestGetContextTool:
         assert isinstance(result, dict), "Should return dict"
         assert result.get('content', '') == '', "Should return empty content"
     
-    def test_get_context_expansion_modes(self):
+    def test_get_context_expansion_modes(self, cached_get_context):
         """Verify different expansion modes work."""
         modes = ["paragraph", "line", "section"]
         
         for mode in modes:
-            result = get_context(
+            result = cached_get_context(
                 "articles/the-mist-keeper-universe.md",
                 expansion_mode=mode,
                 return_metadata=True
@@ -153,6 +193,7 @@ class TestGetContextTool:
             assert isinstance(result, dict), f"Should work with mode={mode}"
 
 
+@pytest.mark.slow_init
 class TestSelfHealing:
     """Test that get_context() is self-healing when index not loaded."""
     
@@ -168,7 +209,8 @@ class TestSelfHealing:
         # Verify index gets loaded by first call
         result = get_context("articles/the-mist-keeper-universe.md", return_metadata=True)
         
-        # Check that index is now loaded
+        # Check that index is now loaded - ask the server itself, since
+        # this is the test that verifies self-healing actually happened
         status = client.status()
         assert status['loaded'], "Index should be loaded after get_context()"
     
@@ -190,9 +232,9 @@ class TestSelfHealing:
 class TestMultiDocumentExpansion:
     """Test memtool's multi-document expansion capabilities."""
     
-    def test_expansion_includes_metadata(self):
+    def test_expansion_includes_metadata(self, cached_get_context):
         """Verify expanded context includes interval metadata."""
-        result = get_context("articles/the-mist-keeper-universe.md", return_metadata=True)
+        result = cached_get_context("articles/the-mist-keeper-universe.md", return_metadata=True)
         
         if result.get('intervals'):
             interval = result['intervals'][0]
@@ -200,13 +242,13 @@ class TestMultiDocumentExpansion:
             assert 'start' in interval, "Interval should have 'start' field"
             assert 'end' in interval, "Interval should have 'end' field"
     
-    def test_num_docs_reflects_expansion(self):
+    def test_num_docs_reflects_expansion(self, cached_get_context):
         """Verify num_docs counts unique documents in expansion."""
-        result = get_context("articles/the-mist-keeper-universe.md", return_metadata=True)
+        result = cached_get_context("articles/the-mist-keeper-universe.md", return_metadata=True)
         
         if result.get('intervals'):
             # Count unique docs manually
-            unique_docs = set(i['path'] for i in result['intervals'])
+            unique_docs = {i['path'] for i in result['intervals']}
             
             assert result['num_docs'] == len(unique_docs), \
                 "num_docs should match unique document count"
@@ -229,36 +271,37 @@ class TestErrorHandling:
     
     def test_handles_invalid_expansion_mode(self):
         """Verify handling of invalid expansion modes."""
-        # memtool might validate this, but we should handle gracefully
-        try:
-            result = get_context(
-                "articles/the-mist-keeper-universe.md",
-                expansion_mode="invalid_mode",
-                return_metadata=True
-            )
-            # If it doesn't raise, should return a dict
-            assert isinstance(result, dict), "Should return dict or raise exception"
-        except Exception as e:
-            # If it raises, that's also acceptable
-            pass
+        # get_context() only lets ConnectionError escape - anything memtool
+        # raises for a bad mode comes back as a dict
+        result = get_context(
+            "articles/the-mist-keeper-universe.md",
+            expansion_mode="invalid_mode",
+            return_metadata=True
+        )
+        
+        assert isinstance(result, dict), "Should return dict, not raise"
 
 
 class TestRealWorldUsage:
     """Test real-world usage patterns."""
     
-    def test_multiple_sequential_calls(self):
-        """Verify multiple sequential calls all work correctly."""
+    def test_concurrent_calls(self):
+        """Verify several get_context calls issued concurrently all work correctly."""
         files = [
             "articles/the-mist-keeper-universe.md",
             "articles/comprehensive-collection-summary.md",
             "articles/reading-guide-the-dreamers-gift.md"
         ]
         
-        results = []
-        for file in files:
-            result = get_context(file, return_metadata=True)
-            results.append(result)
-            
+        async def fetch_all():
+            # Independent queries - overlap their memtool roundtrips
+            return await asyncio.gather(
+                *[aget_context(file, return_metadata=True) for file in files]
+            )
+        
+        results = asyncio.run(fetch_all())
+        
+        for file, result in zip(files, results):
             # Each should work
             assert isinstance(result, dict), f"Should return dict for {file}"
         
@@ -267,18 +310,18 @@ class TestRealWorldUsage:
         status = client.status()
         assert status['loaded'], "Index should still be loaded after all calls"
     
-    def test_mixed_simple_and_metadata_calls(self):
+    def test_mixed_simple_and_metadata_calls(self, cached_get_context):
         """Verify mixing simple and metadata calls works."""
         # Simple call
-        content1 = get_context("articles/the-mist-keeper-universe.md")
+        content1 = cached_get_context("articles/the-mist-keeper-universe.md")
         assert isinstance(content1, str), "Simple call should return string"
         
         # Metadata call
-        result2 = get_context("articles/the-mist-keeper-universe.md", return_metadata=True)
+        result2 = cached_get_context("articles/the-mist-keeper-universe.md", return_metadata=True)
         assert isinstance(result2, dict), "Metadata call should return dict"
         
         # Another simple call
-        content3 = get_context("articles/the-mist-keeper-universe.md")
+        content3 = cached_get_context("articles/the-mist-keeper-universe.md")
         assert isinstance(content3, str), "Second simple call should return string"
 
 
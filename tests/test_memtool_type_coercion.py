@@ -6,11 +6,6 @@ Our tool should handle this gracefully.
 """
 
 import pytest
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from tools.context import get_context
 import tools.context
@@ -22,115 +17,50 @@ def reset_module_state():
     tools.context._memtool_client = None
     tools.context._index_ensured = False
     yield
-    if tools.context._memtool_client:
-        try:
-            tools.context._memtool_client.close()
-        except:
-            pass
-    tools.context._memtool_client = None
+    # Cleanup after test - no-op when the test never created a client
+    tools.context.close_memtool_client()
     tools.context._index_ensured = False
 
 
 class TestTypeCoercion:
     """Test that get_context handles type coercion from LLM calls."""
     
-    def test_string_line_numbers_from_llm(self):
+    @pytest.mark.parametrize(
+        "start_line, end_line, padding, return_metadata",
+        [
+            ("1", "50", "1", False),  # Exact LLM call that raised TypeError
+            (1, 50, 1, False),        # Integers still work (backward compatibility)
+            ("1", 50, 1, False),      # Mixed string/int arguments
+            ("1", "50", "1", True),   # Metadata mode with string arguments
+        ],
+        ids=["string_args", "int_args", "mixed_args", "metadata_string_args"]
+    )
+    def test_numeric_args_are_coerced(self, start_line, end_line, padding, return_metadata):
         """
-        Verify string line numbers are converted to ints.
-        
-        When LLMs call tools through litellm, they often pass:
-        - start_line: "1" (string)
-        - end_line: "50" (string)
+        Verify string and int line numbers both work.
         
-        But memtool expects integers!
+        When LLMs call tools through litellm, they often pass numbers as
+        strings (start_line: "1", end_line: "50", padding: "1").
+        But memtool expects integers! This should work, not raise:
+        TypeError: '<' not supported between instances of 'int' and 'str'
         """
-        # This is what the LLM actually passes
-        result = get_context(
-            document="articles/the-mist-keeper-project.md",
-            start_line="1",  # STRING, not int!
-            end_line="50",   # STRING, not int!
-            expansion_mode="paragraph",
-            padding="1"      # STRING, not int!
-        )
-        
-        # Should work, not crash with TypeError
-        assert isinstance(result, str), "Should return string in simple mode"
-        assert len(result) > 0, "Should return content"
-        print(f"\n✓ Successfully handled string arguments, got {len(result)} chars")
-    
-    def test_integer_line_numbers_still_work(self):
-        """Verify integer line numbers still work (backward compatibility)."""
         result = get_context(
             document="articles/the-mist-keeper-project.md",
-            start_line=1,   # INT
-            end_line=50,    # INT
+            start_line=start_line,
+            end_line=end_line,
             expansion_mode="paragraph",
-            padding=1       # INT
+            padding=padding,
+            return_metadata=return_metadata
         )
         
-        assert isinstance(result, str), "Should return string"
-        assert len(result) > 0, "Should return content"
-        print(f"\n✓ Integer arguments work, got {len(result)} chars")
-    
-    def test_mixed_types(self):
-        """Verify mixed string/int arguments work."""
-        result = get_context(
-            document="articles/the-mist-keeper-project.md",
-            start_line="1",    # STRING
-            end_line=50,       # INT (mixed!)
-            expansion_mode="paragraph",
-            padding=1
-        )
+        if return_metadata:
+            assert isinstance(result, dict), "Should return dict in metadata mode"
+            content = result.get('content', '')
+        else:
+            assert isinstance(result, str), "Should return string in simple mode"
+            content = result
         
-        assert isinstance(result, str), "Should return string"
-        assert len(result) > 0, "Should return content"
-        print(f"\n✓ Mixed types work, got {len(result)} chars")
-    
-    def test_metadata_mode_with_string_args(self):
-        """Verify metadata mode works with string arguments."""
-        result = get_context(
-            document="articles/the-mist-keeper-project.md",
-            start_line="1",
-            end_line="50",
-            expansion_mode="paragraph",
-            padding="1",
-            return_metadata=True  # Request metadata
-        )
-        
-        assert isinstance(result, dict), "Should return dict in metadata mode"
-        assert 'content' in result, "Should have content"
-        assert len(result['content']) > 0, "Should have content"
-        print(f"\n✓ Metadata mode with strings works: {result['num_docs']} docs")
-    
-    def test_exact_llm_call_from_error(self):
-        """
-        Reproduce the exact LLM call that caused the error.
-        
-        From the user's error:
-        {
-          "document": "articles/the-mist-keeper-project.md",
-          "start_line": "1",
-          "end_line": "50",
-          "expansion_mode": "paragraph",
-          "padding": "1"
-        }
-        
-        This should work, not raise TypeError!
-        """
-        result = get_context(
-            document="articles/the-mist-keeper-project.md",
-            start_line="1",
-            end_line="50",
-            expansion_mode="paragraph",
-            padding="1"
-        )
-        
-        print(f"\n✓ EXACT LLM CALL WORKS! Got {len(result)} chars")
-        assert isinstance(result, str), "Should return string"
-        assert len(result) > 0, "Should have content"
-        
-        # Should NOT raise:
-        # TypeError: '<' not supported between instances of 'int' and 'str'
+        assert len(content) > 0, "Should return content"
 
 
 class TestInvalidTypes:
@@ -138,18 +68,14 @@ class TestInvalidTypes:
     
     def test_non_numeric_string(self):
         """Verify non-numeric strings are handled gracefully."""
-        try:
-            result = get_context(
-                document="articles/the-mist-keeper-project.md",
-                start_line="abc",  # Invalid!
-                end_line="50"
-            )
-            # If it doesn't raise, it should return error
-            assert 'error' in str(result).lower() or result == "", \
-                "Should handle invalid input gracefully"
-        except ValueError:
-            # Raising ValueError is also acceptable
-            pass
+        result = get_context(
+            document="articles/the-mist-keeper-project.md",
+            start_line="abc",  # Invalid!
+            end_line="50"
+        )
+        
+        # Coercion fails before memtool is queried and comes back as an error string
+        assert "error" in result.lower(), "Should handle invalid input gracefully"
     
     def test_negative_line_numbers(self):
         """Verify negative line numbers are handled."""
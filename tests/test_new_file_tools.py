@@ -2,56 +2,67 @@
 Tests for the new general-purpose file tools (read_file, edit_file, add_to_story).
 """
 import pytest
+import re
 import tempfile
-from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.tools.files import read_file, edit_file, add_to_story
 
+# Shared fixture payload, built once at import instead of per test
+_FIVE_LINES = b"Line 1\nLine 2\nLine 3\nLine 4\nLine 5\n"
+
+# Matches every line test_multiple_search_replace_blocks expects, in one scan
+_MULTI_BLOCK_PATTERN = re.compile(r"Line (ONE|2|THREE)")
+
+
+@pytest.fixture(scope="session")
+def readonly_wiki(tmp_path_factory):
+    """Build a wikicontent tree once per session for tests that only read."""
+    wikicontent = tmp_path_factory.mktemp("wikicontent")
+    
+    articles = wikicontent / "articles"
+    articles.mkdir()
+    (articles / "test.md").write_bytes(b"# Test\n\nContent here\n")
+    
+    stories = wikicontent / "stories"
+    stories.mkdir()
+    (stories / "story.md").write_bytes(_FIVE_LINES)
+    
+    return wikicontent
+
 
 class TestReadFile:
     """Test read_file functionality."""
     
-    def test_reads_file_successfully(self, tmp_path, monkeypatch):
+    def test_reads_file_successfully(self, readonly_wiki, monkeypatch):
         """Should read file content."""
-        wikicontent = tmp_path / "wikicontent"
-        articles = wikicontent / "articles"
-        articles.mkdir(parents=True)
-        
-        test_file = articles / "test.md"
-        test_file.write_text("# Test\n\nContent here\n")
-        
-        monkeypatch.setenv("WIKICONTENT_PATH", str(wikicontent))
+        monkeypatch.setenv("WIKICONTENT_PATH", str(readonly_wiki))
         
         result = read_file("articles/test.md")
         
         assert "content" in result
         assert result["content"] == "# Test\n\nContent here\n"
     
-    def test_reads_file_with_line_range(self, tmp_path, monkeypatch):
+    def test_reads_file_with_line_range(self, readonly_wiki, monkeypatch):
         """Should read specific line range."""
-        wikicontent = tmp_path / "wikicontent"
-        stories = wikicontent / "stories"
-        stories.mkdir(parents=True)
-        
-        test_file = stories / "story.md"
-        test_file.write_text("Line 1\nLine 2\nLine 3\nLine 4\nLine 5\n")
-        
-        monkeypatch.setenv("WIKICONTENT_PATH", str(wikicontent))
+        monkeypatch.setenv("WIKICONTENT_PATH", str(readonly_wiki))
         
         result = read_file("stories/story.md", start_line=2, end_line=4)
         
         assert "content" in result
         assert result["content"] == "Line 2\nLine 3\nLine 4"
     
-    def test_returns_error_for_nonexistent_file(self, tmp_path, monkeypatch):
-        """Should return error dict for missing file."""
-        wikicontent = tmp_path / "wikicontent"
-        wikicontent.mkdir()
+    def test_reads_file_from_start_line_to_end(self, readonly_wiki, monkeypatch):
+        """Should read from start_line through the last line without a trailing newline."""
+        monkeypatch.setenv("WIKICONTENT_PATH", str(readonly_wiki))
         
-        monkeypatch.setenv("WIKICONTENT_PATH", str(wikicontent))
+        result = read_file("stories/story.md", start_line=4)
+        
+        assert result["content"] == "Line 4\nLine 5"
+    
+    def test_returns_error_for_nonexistent_file(self, readonly_wiki, monkeypatch):
+        """Should return error dict for missing file."""
+        monkeypatch.setenv("WIKICONTENT_PATH", str(readonly_wiki))
         
         result = read_file("does/not/exist.md")
         
@@ -94,7 +105,7 @@ This is brand new content.
         articles.mkdir(parents=True)
         
         test_file = articles / "wizard.md"
-        test_file.write_text("# Wizard\n\nMerlin was a wizard.\n")
+        test_file.write_bytes(b"# Wizard\n\nMerlin was a wizard.\n")
         
         monkeypatch.setenv("WIKICONTENT_PATH", str(wikicontent))
         
@@ -116,7 +127,7 @@ Merlin was a powerful wizard.
         articles.mkdir(parents=True)
         
         test_file = articles / "story.md"
-        test_file.write_text("Line 1\nLine 2\nLine 3\n")
+        test_file.write_bytes(b"Line 1\nLine 2\nLine 3\n")
         
         monkeypatch.setenv("WIKICONTENT_PATH", str(wikicontent))
         
@@ -135,9 +146,8 @@ Line THREE
         
         assert result["success"] is True
         content = test_file.read_text()
-        assert "Line ONE" in content
-        assert "Line THREE" in content
-        assert "Line 2" in content  # Unchanged
+        # Both replacements applied, "Line 2" unchanged
+        assert {"ONE", "2", "THREE"} <= set(_MULTI_BLOCK_PATTERN.findall(content))
     
     def test_returns_error_for_search_not_found(self, tmp_path, monkeypatch):
         """Should return error when search text doesn't exist."""
@@ -146,7 +156,7 @@ Line THREE
         articles.mkdir(parents=True)
         
         test_file = articles / "test.md"
-        test_file.write_text("Some content\n")
+        test_file.write_bytes(b"Some content\n")
         
         monkeypatch.setenv("WIKICONTENT_PATH", str(wikicontent))
         
@@ -198,9 +208,7 @@ class TestAddToStory:
         
         # Verify content was appended
         content = story_file.read_text()
-        assert "Chapter 1" in content
-        assert "Chapter 2" in content
-        assert content.endswith("The middle.\n")
+        assert all(s in content for s in ("Chapter 1", "Chapter 2")) and content.endswith("The middle.\n")
     
     def test_creates_file_if_not_exists(self, tmp_path, monkeypatch):
         """Should create file if it doesn't exist."""
@@ -235,16 +243,23 @@ class TestAddToStory:
         assert result["lines_added"] == 3  # 2 newlines + 1
 
 
+@pytest.fixture(scope="class")
+def integration_wiki(tmp_path_factory):
+    """One wikicontent tree shared by the staged TestToolIntegration tests."""
+    wikicontent = tmp_path_factory.mktemp("intwiki")
+    
+    # monkeypatch is function-scoped, so manage the env var for the whole class here
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("WIKICONTENT_PATH", str(wikicontent))
+        yield wikicontent
+
+
+@pytest.mark.usefixtures("integration_wiki")
 class TestToolIntegration:
     """Test tools working together."""
     
-    def test_edit_then_read(self, tmp_path, monkeypatch):
+    def test_edit_then_read(self):
         """Should be able to edit then read back."""
-        wikicontent = tmp_path / "wikicontent"
-        wikicontent.mkdir()
-        
-        monkeypatch.setenv("WIKICONTENT_PATH", str(wikicontent))
-        
         # Create file
         diff = """<<<<<<< SEARCH
 =======
@@ -261,13 +276,8 @@ Initial content.
         assert "content" in read_result
         assert "Initial content" in read_result["content"]
     
-    def test_add_to_story_then_edit(self, tmp_path, monkeypatch):
+    def test_add_to_story_then_edit(self):
         """Should be able to append then edit."""
-        wikicontent = tmp_path / "wikicontent"
-        wikicontent.mkdir()
-        
-        monkeypatch.setenv("WIKICONTENT_PATH", str(wikicontent))
-        
         # Add initial content
         add_result = add_to_story("Chapter 1\nThe hero awoke.\n", "story.md")
         assert add_result["success"] is True
@@ -289,8 +299,7 @@ The hero awoke with a start.
         # Verify
         read_result = read_file("story.md")
         content = read_result["content"]
-        assert "awoke with a start" in content
-        assert "villain appeared" in content
+        assert all(s in content for s in ("awoke with a start", "villain appeared"))
 
 
 if __name__ == "__main__":
@@ -1,28 +1,79 @@
 """
 Test that mimics EXACTLY how BaseAgent calls litellm and tracks costs.
 This will verify that our cost tracking setup actually works.
+
+By default litellm.acompletion() is served from responses recorded from the
+real API (tests/fixtures/litellm_cost_tracking.json), so the tests are fast,
+free and offline. Run `pytest --run-live -m live` (with ANTHROPIC_API_KEY set) to run them
+against Anthropic instead.
 """
+import asyncio
+import json
+import logging
+import os
+from pathlib import Path
+
 import litellm
+import pytest
 
+logger = logging.getLogger(__name__)
 
-def test_exact_baseagent_pattern():
-    """Test the exact pattern used in BaseAgent for streaming + cost tracking."""
+RECORDED_RESPONSES = Path(__file__).parent / "fixtures" / "litellm_cost_tracking.json"
+
+
+# Deselected unless --run-live is given (tests/conftest.py); skipped if there is no key
+requires_api_key = pytest.mark.skipif(not os.getenv("ANTHROPIC_API_KEY"), reason="no ANTHROPIC_API_KEY")
+LIVE = [pytest.mark.live, requires_api_key]
+
+
+@pytest.fixture(params=["recorded", pytest.param("live", marks=LIVE)])
+def llm_backend(request, monkeypatch):
+    """Replay recorded litellm responses, or use the live API when selected."""
+    if request.param == "live":
+        return request.param
     
-    print("\n" + "="*60)
-    print("Testing EXACT BaseAgent pattern for cost tracking")
-    print("="*60)
+    recorded = json.loads(RECORDED_RESPONSES.read_text())
     
+    async def replay_stream():
+        for chunk in recorded["streaming_chunks"]:
+            yield litellm.ModelResponseStream(**chunk)
+    
+    async def replay_acompletion(**kwargs):
+        if kwargs.get("stream"):
+            return replay_stream()
+        return litellm.ModelResponse(**recorded["non_streaming_response"])
+    
+    monkeypatch.setattr(litellm, "acompletion", replay_acompletion)
+    return request.param
+
+
+pytestmark = pytest.mark.usefixtures("llm_backend")
+
+
+def assert_cost_nonzero(response):
+    """Check a complete ModelResponse carries usage and a non-zero cost; return the cost."""
+    assert response.usage.prompt_tokens > 0, "Should have prompt tokens"
+    assert response.usage.completion_tokens > 0, "Should have completion tokens"
+    
+    cost = litellm.completion_cost(completion_response=response)
+    assert cost > 0, "Cost should be greater than 0"
+    return cost
+
+
+async def run_baseagent_pattern():
+    """Make BaseAgent's streaming call and cost the turn the way BaseAgent does.
+    
+    BaseAgent costs streamed turns from the prompt and completion strings
+    (the stream is consumed by then); that is the cost asserted here. The
+    response rebuilt from the chunks is also checked for usage and cost.
+    """
     # Mimic BaseAgent's call exactly
     model = "claude-haiku-4-5-20251001"
     messages = [{"role": "user", "content": "Say 'hello' once."}]
     stream = True
     
-    print(f"\n1. Making litellm.completion() call...")
-    print(f"   Model: {model}")
-    print(f"   Stream: {stream}")
-    print(f"   Stream options: {{'include_usage': True}}")
-    
-    response = litellm.completion(
+    logger.debug("Streaming acompletion: model=%s stream_options=include_usage", model)
+    response = await litellm.acompletion(
         model=model,
         messages=messages,
         tools=None,
@@ -32,114 +83,132 @@ def test_exact_baseagent_pattern():
         temperature=1.0
     )
     
-    print(f"\n2. Iterating through streaming response...")
-    
-    usage_info = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
-    collected_content = ""
-    chunk_count = 0
-    
-    for chunk in response:
-        chunk_count += 1
-        
-        # Collect content
-        if chunk.choices[0].delta.content:
-            content = chunk.choices[0].delta.content
-            collected_content += content
-            print(f"   Chunk {chunk_count}: '{content}'")
-        
-        # Check for usage (should be in final chunk)
-        if hasattr(chunk, 'usage') and chunk.usage:
-            usage_info["prompt_tokens"] = getattr(chunk.usage, 'prompt_tokens', 0)
-            usage_info["completion_tokens"] = getattr(chunk.usage, 'completion_tokens', 0)
-            usage_info["total_tokens"] = getattr(chunk.usage, 'total_tokens', 0)
-            print(f"\n   ✅ Found usage info in chunk {chunk_count}!")
-            print(f"      Prompt tokens: {usage_info['prompt_tokens']}")
-            print(f"      Completion tokens: {usage_info['completion_tokens']}")
-            print(f"      Total tokens: {usage_info['total_tokens']}")
-    
-    print(f"\n3. Collected content: '{collected_content}'")
-    
-    # Verify we got usage info
-    assert usage_info["prompt_tokens"] > 0, "Should have prompt tokens"
-    assert usage_info["completion_tokens"] > 0, "Should have completion tokens"
-    print(f"\n   ✅ Usage info successfully extracted!")
-    
-    # Calculate cost EXACTLY like BaseAgent does (no mocking!)
-    print(f"\n4. Calculating cost with litellm.completion_cost()...")
-    print(f"   Using prompt/completion strings method (BaseAgent's streaming approach)")
-    
-    # Extract prompt from messages (like BaseAgent does)
-    prompt_text = " ".join([m["content"] for m in messages if m.get("role") == "user"])
-    
-    print(f"   Prompt: '{prompt_text}'")
-    print(f"   Completion: '{collected_content}'")
-    
-    try:
-        cost = litellm.completion_cost(
-            model=model,
-            prompt=prompt_text,
-            completion=collected_content
-        )
-        
-        print(f"\n   ✅ Cost calculated: ${cost:.6f}")
-        
-        assert cost > 0, "Cost should be greater than 0"
-        print(f"   ✅ Cost is non-zero!")
-        
-        return cost
-        
-    except Exception as e:
-        print(f"   ❌ Error calculating cost: {e}")
-        raise
-
-
-def test_non_streaming_pattern():
-    """Test non-streaming pattern for comparison."""
+    chunks = [chunk async for chunk in response]
+    full_response = litellm.stream_chunk_builder(chunks, messages=messages)
+    collected_content = full_response.choices[0].message.content
     
-    print("\n" + "="*60)
-    print("Testing non-streaming pattern (for comparison)")
-    print("="*60)
+    # The rebuilt response carries the usage reported in the final chunk
+    rebuilt_cost = assert_cost_nonzero(full_response)
+    
+    # Cost the turn exactly as BaseAgent's streaming path does
+    prompt_text = " ".join([msg.get("content", "") for msg in messages if msg.get("role") == "user"])
+    cost = litellm.completion_cost(
+        model=model,
+        prompt=prompt_text,
+        completion=collected_content
+    )
+    assert cost > 0, "Cost should be greater than 0"
+    logger.info(
+        "Streaming: %d chunks, content=%r, %dp + %dc tokens, cost $%.6f (from usage $%.6f)",
+        len(chunks), collected_content,
+        full_response.usage.prompt_tokens, full_response.usage.completion_tokens,
+        cost, rebuilt_cost
+    )
     
+    return cost
+
+
+async def run_non_streaming_pattern():
+    """Run non-streaming pattern for comparison."""
     model = "claude-haiku-4-5-20251001"
     messages = [{"role": "user", "content": "Say 'hello' once."}]
     
-    print(f"\n1. Making non-streaming litellm.completion() call...")
-    
-    response = litellm.completion(
+    logger.debug("Non-streaming acompletion: model=%s", model)
+    response = await litellm.acompletion(
         model=model,
         messages=messages,
         stream=False,
         temperature=1.0
     )
     
-    print(f"   ✅ Response received")
-    print(f"   Content: '{response.choices[0].message.content}'")
-    print(f"   Usage: {response.usage.prompt_tokens}p + {response.usage.completion_tokens}c")
-    
     # Calculate cost directly from response
-    print(f"\n2. Calculating cost...")
+    cost = assert_cost_nonzero(response)
+    logger.info(
+        "Non-streaming: content=%r, %dp + %dc tokens, cost $%.6f",
+        response.choices[0].message.content,
+        response.usage.prompt_tokens, response.usage.completion_tokens, cost
+    )
+    
+    return cost
+
+
+async def run_prompt_caching_pattern():
+    """Run the same cached system prompt twice; the second call should read the cache.
+    
+    BaseAgent does not send ``cache_control`` today, so this is not a production
+    code path. It only checks that Anthropic (through litellm) honours the marker
+    and bills cache reads at the cached rate, ahead of a possible future
+    optimization. It makes two live calls of roughly 4k prompt tokens each.
+    """
+    # Import here so the module still runs as a script without src/ on the path
+    from agents.prompts.loader import build_agent_prompt
+    
+    model = "claude-haiku-4-5-20251001"
+    # The real writer prompt is long enough to clear Anthropic's minimum cacheable size
+    system_prompt = build_agent_prompt("writer", include_tools=True)
+    messages = [
+        {
+            "role": "system",
+            "content": [
+                {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+            ]
+        },
+        {"role": "user", "content": "Say 'hello' once."}
+    ]
+    
+    # Sequential on purpose - the first call writes the cache the second one reads
+    logger.debug("Writing cache (%d char system prompt)", len(system_prompt))
+    await litellm.acompletion(model=model, messages=messages, temperature=1.0)
+    
+    response = await litellm.acompletion(model=model, messages=messages, temperature=1.0)
+    usage = response.usage
+    
+    assert usage.cache_read_input_tokens > 0, "Second call should read from the prompt cache"
+    
+    # Compare against what the same tokens would cost without caching
     cost = litellm.completion_cost(completion_response=response)
-    print(f"   ✅ Cost: ${cost:.6f}")
+    prompt_cost, completion_cost = litellm.cost_per_token(
+        model=model,
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens
+    )
+    uncached_cost = prompt_cost + completion_cost
+    logger.info(
+        "Prompt caching: %d cache read tokens, cost $%.6f (uncached $%.6f)",
+        usage.cache_read_input_tokens, cost, uncached_cost
+    )
     
-    assert cost > 0, "Cost should be greater than 0"
+    assert cost < uncached_cost * 0.5, "Cached call should cost well under half the uncached price"
     
     return cost
 
 
+def test_exact_baseagent_pattern():
+    """Test the exact pattern used in BaseAgent for streaming + cost tracking."""
+    asyncio.run(run_baseagent_pattern())
+
+
+def test_non_streaming_pattern():
+    """Test non-streaming pattern for comparison."""
+    asyncio.run(run_non_streaming_pattern())
+
+
+@pytest.mark.parametrize("llm_backend", [pytest.param("live", marks=LIVE)], indirect=True)
+def test_prompt_caching_pattern():
+    """Check provider support for cache_control billing (live only; not used by BaseAgent yet)."""
+    asyncio.run(run_prompt_caching_pattern())
+
+
+async def main():
+    """Run both patterns concurrently - the two API calls are independent."""
+    return await asyncio.gather(run_baseagent_pattern(), run_non_streaming_pattern())
+
+
 if __name__ == "__main__":
-    print("\n" + "🔬 Testing Real LiteLLM Cost Tracking" + "\n")
-    
-    # Test streaming (what BaseAgent uses)
-    streaming_cost = test_exact_baseagent_pattern()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     
-    # Test non-streaming (for comparison)
-    non_streaming_cost = test_non_streaming_pattern()
+    # Streaming (what BaseAgent uses) and non-streaming (for comparison)
+    streaming_cost, non_streaming_cost = asyncio.run(main())
     
-    print("\n" + "="*60)
-    print("RESULTS")
-    print("="*60)
-    print(f"Streaming cost:     ${streaming_cost:.6f}")
-    print(f"Non-streaming cost: ${non_streaming_cost:.6f}")
-    print(f"\n✅ Both patterns work! Cost tracking should work in BaseAgent.")
-    print("="*60)
-
+    logger.info("Streaming cost:     $%.6f", streaming_cost)
+    logger.info("Non-streaming cost: $%.6f", non_streaming_cost)
@@ -1,51 +1,78 @@
 """
 Tests for rename_my_story() tool and rename_story_file() utility.
 """
-import pytest
-import tempfile
-import shutil
-import os
-from pathlib import Path
+import copy
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import pytest
 
 from src.tools.files import rename_story_file, add_to_story
 from src.agents.writer_agent import WriterAgent
 
 
 @pytest.fixture
-def temp_wikicontent():
-    """Create a temporary wikicontent directory for testing."""
-    temp_dir = tempfile.mkdtemp(prefix='test_wikicontent_')
-    original_path = os.environ.get('WIKICONTENT_PATH')
-    os.environ['WIKICONTENT_PATH'] = temp_dir
-    
-    yield Path(temp_dir)
-    
-    # Cleanup
-    if original_path:
-        os.environ['WIKICONTENT_PATH'] = original_path
-    else:
-        del os.environ['WIKICONTENT_PATH']
-    
-    if Path(temp_dir).exists():
-        shutil.rmtree(temp_dir)
+def temp_wikicontent(tmp_path, monkeypatch):
+    """Point WIKICONTENT_PATH at a per-test temporary directory."""
+    monkeypatch.setenv("WIKICONTENT_PATH", str(tmp_path))
+    return tmp_path
 
 
 @pytest.fixture
-def temp_session():
+def temp_session(monkeypatch):
     """Set a temporary session name for testing."""
-    original_session = os.environ.get('SESSION_NAME')
-    os.environ['SESSION_NAME'] = 'test_session_rename'
-    
-    yield 'test_session_rename'
-    
-    # Restore
-    if original_session:
-        os.environ['SESSION_NAME'] = original_session
-    else:
-        del os.environ['SESSION_NAME']
+    monkeypatch.setenv("SESSION_NAME", "test_session_rename")
+    return "test_session_rename"
+
+
+def get_tool(agent, name):
+    """Return the callable behind the agent's tool ``name``."""
+    return next(t["_function"] for t in agent.tools if t["function"]["name"] == name)
+
+
+def tool_names(agent):
+    """Return the names of the agent's tools."""
+    return {t["function"]["name"] for t in agent.tools}
+
+
+def assert_renamed_same_inode(source, target, source_inode):
+    """The file moved via rename(2): source gone, target is the same inode (not a copy)."""
+    assert not source.exists()
+    assert target.exists()
+    assert target.stat().st_ino == source_inode
+
+
+# Tools whose _function closes over the agent instance and must be rebound per clone
+SELF_BOUND_TOOLS = {"rename_my_story", "add_to_my_story"}
+
+
+@pytest.fixture(scope="module")
+def agent_template():
+    """One WriterAgent built per module; tests clone it via make_agent."""
+    return WriterAgent(story_file="stories/placeholder.md", agent_id="template")
+
+
+@pytest.fixture
+def make_agent(agent_template):
+    """Factory returning a cheap copy of agent_template for a given story file.
+
+    Stateless tool definitions are shared with the template; only the tools
+    bound to the agent instance are rebuilt.
+    """
+    def _make_agent(story_file, agent_id):
+        agent = copy.copy(agent_template)
+        agent.story_file = story_file
+        agent.agent_id = agent_id
+        agent.messages = []
+        agent.memory = {}
+        agent.tools = [
+            t for t in agent_template.tools
+            if t["function"]["name"] not in SELF_BOUND_TOOLS
+        ]
+        agent._add_rename_tool()
+        agent._add_my_story_tool()
+        agent._rebuild_system_prompt()
+        return agent
+
+    return _make_agent
 
 
 class TestRenameStoryFileUtility:
@@ -67,7 +94,7 @@ class TestRenameStoryFileUtility:
         assert result["new_path"] == "stories/renamed.md"
         assert "Renamed story file" in result["message"]
         
-        # Verify filesystem
+        # Verify filesystem - the one content read-back; other rename tests compare inodes
         assert not source_path.exists()
         target_path = temp_wikicontent / "stories" / "renamed.md"
         assert target_path.exists()
@@ -79,14 +106,14 @@ class TestRenameStoryFileUtility:
         source_path = temp_wikicontent / "stories" / "temp.md"
         source_path.parent.mkdir(parents=True, exist_ok=True)
         source_path.write_text("# Temp\n\nContent here.")
+        source_inode = source_path.stat().st_ino
         
         # Rename to new subdirectory
         result = rename_story_file("stories/temp.md", "stories/archive/2025/temp.md")
         
         assert result["success"] is True
         target_path = temp_wikicontent / "stories" / "archive" / "2025" / "temp.md"
-        assert target_path.exists()
-        assert "Content here" in target_path.read_text()
+        assert_renamed_same_inode(source_path, target_path, source_inode)
     
     def test_fails_if_source_not_found(self, temp_wikicontent):
         """Should return error if source file doesn't exist."""
@@ -117,15 +144,14 @@ class TestRenameStoryFileUtility:
         source = temp_wikicontent / "drafts" / "story.md"
         source.parent.mkdir(parents=True, exist_ok=True)
         source.write_text("# Draft Story\n\nIn progress...")
+        source_inode = source.stat().st_ino
         
         # Rename to completely different path
         result = rename_story_file("drafts/story.md", "stories/published/final.md")
         
         assert result["success"] is True
-        assert not source.exists()
         target = temp_wikicontent / "stories" / "published" / "final.md"
-        assert target.exists()
-        assert "In progress" in target.read_text()
+        assert_renamed_same_inode(source, target, source_inode)
 
 
 class TestWriterAgentRenameTool:
@@ -135,16 +161,21 @@ class TestWriterAgentRenameTool:
         """WriterAgent should have rename_my_story in its tools."""
         agent = WriterAgent(story_file="stories/test.md", agent_id="writer-001")
         
-        tool_names = [t.get('function', {}).get('name') for t in agent.tools]
-        assert 'rename_my_story' in tool_names
-    
-    def test_rename_updates_agent_story_file(self, temp_wikicontent, temp_session):
+        assert 'rename_my_story' in tool_names(agent)
+
+    def test_cloned_agent_matches_fresh_agent(self, temp_wikicontent, temp_session, make_agent):
+        """make_agent clones should expose the same tools and prompt as a fresh WriterAgent."""
+        fresh = WriterAgent(story_file="stories/test.md", agent_id="writer-001")
+        clone = make_agent("stories/test.md", "writer-001")
+
+        assert tool_names(clone) == tool_names(fresh)
+        assert get_tool(clone, "rename_my_story") is not get_tool(fresh, "rename_my_story")
+        assert clone.system_prompt == fresh.system_prompt
+
+    def test_rename_updates_agent_story_file(self, temp_wikicontent, temp_session, make_agent):
         """Renaming should update the agent's story_file attribute."""
         # Create agent
-        agent = WriterAgent(
-            story_file="stories/old_name.md",
-            agent_id="writer-001"
-        )
+        agent = make_agent("stories/old_name.md", "writer-001")
         
         # Create the story file
         story_path = temp_wikicontent / agent.story_file
@@ -152,13 +183,7 @@ class TestWriterAgentRenameTool:
         story_path.write_text("# Old Story\n\nChapter 1...")
         
         # Find rename tool
-        rename_tool = None
-        for tool in agent.tools:
-            if tool.get('function', {}).get('name') == 'rename_my_story':
-                rename_tool = tool.get('_function')
-                break
-        
-        assert rename_tool is not None
+        rename_tool = get_tool(agent, "rename_my_story")
         
         # Execute rename
         result = rename_tool("new_name.md")
@@ -169,24 +194,18 @@ class TestWriterAgentRenameTool:
         assert result["old_file"] == "stories/old_name.md"
         assert result["new_file"] == "stories/new_name.md"
     
-    def test_rename_updates_filesystem(self, temp_wikicontent, temp_session):
+    def test_rename_updates_filesystem(self, temp_wikicontent, temp_session, make_agent):
         """Renaming should move the actual file."""
-        agent = WriterAgent(
-            story_file="stories/before.md",
-            agent_id="writer-002"
-        )
+        agent = make_agent("stories/before.md", "writer-002")
         
         # Create file with content
         story_path = temp_wikicontent / agent.story_file
         story_path.parent.mkdir(parents=True, exist_ok=True)
-        test_content = "# My Story\n\nThis is important content."
-        story_path.write_text(test_content)
+        story_path.write_text("# My Story\n\nThis is important content.")
+        source_inode = story_path.stat().st_ino
         
         # Get rename tool
-        rename_tool = next(
-            t.get('_function') for t in agent.tools
-            if t.get('function', {}).get('name') == 'rename_my_story'
-        )
+        rename_tool = get_tool(agent, "rename_my_story")
         
         # Rename
         result = rename_tool("after.md")
@@ -195,16 +214,12 @@ class TestWriterAgentRenameTool:
         old_path = temp_wikicontent / "stories" / "before.md"
         new_path = temp_wikicontent / "stories" / "after.md"
         
-        assert not old_path.exists()
-        assert new_path.exists()
-        assert test_content in new_path.read_text()
+        assert result["success"] is True
+        assert_renamed_same_inode(old_path, new_path, source_inode)
     
-    def test_rename_updates_system_prompt(self, temp_wikicontent, temp_session):
+    def test_rename_updates_system_prompt(self, temp_wikicontent, temp_session, make_agent):
         """Renaming should update the agent's system prompt."""
-        agent = WriterAgent(
-            story_file="stories/story_v1.md",
-            agent_id="writer-003"
-        )
+        agent = make_agent("stories/story_v1.md", "writer-003")
         
         # Create file
         story_path = temp_wikicontent / agent.story_file
@@ -215,10 +230,7 @@ class TestWriterAgentRenameTool:
         assert "story_v1.md" in agent.system_prompt
         
         # Get rename tool and execute
-        rename_tool = next(
-            t.get('_function') for t in agent.tools
-            if t.get('function', {}).get('name') == 'rename_my_story'
-        )
+        rename_tool = get_tool(agent, "rename_my_story")
         result = rename_tool("story_v2.md")
         
         # Verify new filename in prompt
@@ -226,12 +238,9 @@ class TestWriterAgentRenameTool:
         assert "story_v2.md" in agent.system_prompt
         assert "story_v1.md" not in agent.system_prompt
     
-    def test_rename_keeps_same_directory_if_only_filename(self, temp_wikicontent, temp_session):
+    def test_rename_keeps_same_directory_if_only_filename(self, temp_wikicontent, temp_session, make_agent):
         """If only filename is provided, should keep same directory."""
-        agent = WriterAgent(
-            story_file="stories/drafts/work.md",
-            agent_id="writer-004"
-        )
+        agent = make_agent("stories/drafts/work.md", "writer-004")
         
         # Create file
         story_path = temp_wikicontent / agent.story_file
@@ -239,10 +248,7 @@ class TestWriterAgentRenameTool:
         story_path.write_text("# Work in Progress")
         
         # Get rename tool
-        rename_tool = next(
-            t.get('_function') for t in agent.tools
-            if t.get('function', {}).get('name') == 'rename_my_story'
-        )
+        rename_tool = get_tool(agent, "rename_my_story")
         
         # Rename with just filename
         result = rename_tool("final.md")
@@ -253,12 +259,9 @@ class TestWriterAgentRenameTool:
         assert not (temp_wikicontent / "stories" / "drafts" / "work.md").exists()
         assert (temp_wikicontent / "stories" / "drafts" / "final.md").exists()
     
-    def test_rename_can_change_directory(self, temp_wikicontent, temp_session):
+    def test_rename_can_change_directory(self, temp_wikicontent, temp_session, make_agent):
         """Providing full path should allow changing directories."""
-        agent = WriterAgent(
-            story_file="stories/drafts/temp.md",
-            agent_id="writer-005"
-        )
+        agent = make_agent("stories/drafts/temp.md", "writer-005")
         
         # Create file
         story_path = temp_wikicontent / agent.story_file
@@ -266,10 +269,7 @@ class TestWriterAgentRenameTool:
         story_path.write_text("# Temporary Draft")
         
         # Get rename tool
-        rename_tool = next(
-            t.get('_function') for t in agent.tools
-            if t.get('function', {}).get('name') == 'rename_my_story'
-        )
+        rename_tool = get_tool(agent, "rename_my_story")
         
         # Rename with full path to different directory
         result = rename_tool("stories/published/final_version.md")
@@ -279,18 +279,12 @@ class TestWriterAgentRenameTool:
         assert agent.story_file == "stories/published/final_version.md"
         assert (temp_wikicontent / "stories" / "published" / "final_version.md").exists()
     
-    def test_rename_fails_gracefully_on_error(self, temp_wikicontent, temp_session):
+    def test_rename_fails_gracefully_on_error(self, temp_wikicontent, temp_session, make_agent):
         """Should return error dict on failure, not raise exception."""
-        agent = WriterAgent(
-            story_file="stories/nonexistent.md",
-            agent_id="writer-006"
-        )
+        agent = make_agent("stories/nonexistent.md", "writer-006")
         
         # Get rename tool
-        rename_tool = next(
-            t.get('_function') for t in agent.tools
-            if t.get('function', {}).get('name') == 'rename_my_story'
-        )
+        rename_tool = get_tool(agent, "rename_my_story")
         
         # Try to rename file that doesn't exist
         result = rename_tool("new_name.md")
@@ -304,12 +298,9 @@ class TestWriterAgentRenameTool:
 class TestRenameToolIntegration:
     """Integration tests for rename tool with other file operations."""
     
-    def test_rename_then_add_content(self, temp_wikicontent, temp_session):
+    def test_rename_then_add_content(self, temp_wikicontent, temp_session, make_agent):
         """Should be able to add content after renaming."""
-        agent = WriterAgent(
-            story_file="stories/story.md",
-            agent_id="writer-int-001"
-        )
+        agent = make_agent("stories/story.md", "writer-int-001")
         
         # Create initial file
         story_path = temp_wikicontent / agent.story_file
@@ -317,10 +308,7 @@ class TestRenameToolIntegration:
         story_path.write_text("# Story\n\n")
         
         # Rename
-        rename_tool = next(
-            t.get('_function') for t in agent.tools
-            if t.get('function', {}).get('name') == 'rename_my_story'
-        )
+        rename_tool = get_tool(agent, "rename_my_story")
         rename_result = rename_tool("epic_tale.md")
         assert rename_result["success"] is True
         
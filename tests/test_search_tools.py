@@ -2,207 +2,95 @@
 Tests for search tools (src/tools/search.py).
 """
 import pytest
-import toml
-from pathlib import Path
-
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.tools import search
+from tests.helpers import touch_many
 
 
-class TestFindArticles:
-    """Test find_articles functionality."""
-    
-    def test_finds_matching_articles(self, tmp_path):
-        """Should find articles matching search term."""
-        config_path = tmp_path / "config.toml"
-        config_path.write_text(toml.dumps({
-            "paths": {
-                "content_repo": str(tmp_path / "content"),
-                "articles_dir": "articles"
-            },
-            "story": {"current_story": "test"}
-        }))
-        
-        articles_dir = tmp_path / "content" / "articles"
-        articles_dir.mkdir(parents=True)
-        
-        (articles_dir / "wizard-merlin.md").write_text("# Merlin\n")
-        (articles_dir / "wizard-gandalf.md").write_text("# Gandalf\n")
-        (articles_dir / "castle.md").write_text("# Castle\n")
-        
-        # Configure module
-        search._config = toml.load(str(config_path))
-        search._content_repo_path = Path(search._config["paths"]["content_repo"])
-        search._articles_dir_name = search._config["paths"]["articles_dir"]
-        
-        result = search.find_articles("wizard")
-        
-        assert len(result) == 2
-        assert "wizard-merlin.md" in result
-        assert "wizard-gandalf.md" in result
-        assert "castle.md" not in result
+@pytest.fixture
+def configure_search(tmp_path, monkeypatch):
+    """Point the search module at a temporary content repo.
+
+    Returns a callable taking ``<kind>=<dir name>`` keyword arguments
+    (e.g. ``articles="articles"``) that sets the matching module attributes
+    and returns the content repo path.
+    """
+    content = tmp_path / "content"
+
+    def _configure(**dirs):
+        monkeypatch.setattr(search, "_config", {"paths": {"content_repo": str(content)}})
+        monkeypatch.setattr(search, "_content_repo_path", content)
+        for kind, dir_name in dirs.items():
+            monkeypatch.setattr(search, f"_{kind}_dir_name", dir_name)
+        return content
+
+    return _configure
+
+
+CASES = [
+    pytest.param("articles", search.find_articles,
+                 ["wizard-merlin.md", "wizard-gandalf.md", "castle.md"], "wizard", 2,
+                 id="articles"),
+    pytest.param("images", search.find_images,
+                 ["castle-ruins.png", "castle-hall.jpg", "wizard.png"], "castle", 2,
+                 id="images"),
+    pytest.param("songs", search.find_songs,
+                 ["epic-battle.mp3", "battle-cry.wav", "peaceful-melody.ogg"], "battle", 2,
+                 id="songs"),
+    pytest.param("articles", search.find_articles,
+                 ["article1.md", "article2.md", "article3.md"], "*", 3,
+                 id="articles-wildcard"),
+    pytest.param("images", search.find_images,
+                 ["image1.png", "image2.jpg"], "*", 2,
+                 id="images-wildcard"),
+]
+
+
+@pytest.mark.parametrize("kind,finder,files,term,expected_count", CASES)
+def test_find_matches(configure_search, kind, finder, files, term, expected_count):
+    """find_articles/find_images/find_songs should match file names by search term."""
+    kind_dir = configure_search(**{kind: kind}) / kind
+    kind_dir.mkdir(parents=True)
+    touch_many(kind_dir, files)
     
-    def test_wildcard_returns_all_articles(self, tmp_path):
-        """Should return all articles when searching with *."""
-        config_path = tmp_path / "config.toml"
-        config_path.write_text(toml.dumps({
-            "paths": {
-                "content_repo": str(tmp_path / "content"),
-                "articles_dir": "articles"
-            },
-            "story": {"current_story": "test"}
-        }))
-        
-        articles_dir = tmp_path / "content" / "articles"
-        articles_dir.mkdir(parents=True)
-        
-        (articles_dir / "article1.md").write_text("# Article 1\n")
-        (articles_dir / "article2.md").write_text("# Article 2\n")
-        (articles_dir / "article3.md").write_text("# Article 3\n")
-        
-        search._config = toml.load(str(config_path))
-        search._content_repo_path = Path(search._config["paths"]["content_repo"])
-        search._articles_dir_name = search._config["paths"]["articles_dir"]
-        
-        result = search.find_articles("*")
-        
-        assert len(result) == 3
-        assert all(f"article{i}.md" in result for i in range(1, 4))
+    result = finder(term)
     
-    def test_case_insensitive_search(self, tmp_path):
-        """Should be case-insensitive."""
-        config_path = tmp_path / "config.toml"
-        config_path.write_text(toml.dumps({
-            "paths": {
-                "content_repo": str(tmp_path / "content"),
-                "articles_dir": "articles"
-            },
-            "story": {"current_story": "test"}
-        }))
-        
-        articles_dir = tmp_path / "content" / "articles"
-        articles_dir.mkdir(parents=True)
-        
-        (articles_dir / "London.md").write_text("# London\n")
-        
-        search._config = toml.load(str(config_path))
-        search._content_repo_path = Path(search._config["paths"]["content_repo"])
-        search._articles_dir_name = search._config["paths"]["articles_dir"]
-        
-        result = search.find_articles("london")
-        
-        assert len(result) == 1
-        assert "London.md" in result
+    assert len(result) == expected_count
+    assert result == sorted(name for name in files if term == "*" or term in name)
 
 
-class TestFindImages:
-    """Test find_images functionality."""
+def test_search_sees_files_added_between_calls(configure_search):
+    """A file added right after a search should show up in the next one."""
+    articles_dir = configure_search(articles="articles") / "articles"
+    articles_dir.mkdir(parents=True)
+    touch_many(articles_dir, ["wizard-merlin.md", "castle.md"])
     
-    def test_finds_matching_images(self, tmp_path):
-        """Should find images matching search term."""
-        config_path = tmp_path / "config.toml"
-        config_path.write_text(toml.dumps({
-            "paths": {
-                "content_repo": str(tmp_path / "content"),
-                "images_dir": "images"
-            },
-            "story": {"current_story": "test"}
-        }))
-        
-        images_dir = tmp_path / "content" / "images"
-        images_dir.mkdir(parents=True)
-        
-        (images_dir / "castle-ruins.png").write_text("")
-        (images_dir / "castle-hall.jpg").write_text("")
-        (images_dir / "wizard.png").write_text("")
-        
-        search._config = toml.load(str(config_path))
-        search._content_repo_path = Path(search._config["paths"]["content_repo"])
-        search._images_dir_name = search._config["paths"]["images_dir"]
-        
-        result = search.find_images("castle")
-        
-        assert len(result) == 2
-        assert "castle-ruins.png" in result
-        assert "castle-hall.jpg" in result
+    assert search.find_articles("wizard") == ["wizard-merlin.md"]
     
-    def test_wildcard_returns_all_images(self, tmp_path):
-        """Should return all images when searching with *."""
-        config_path = tmp_path / "config.toml"
-        config_path.write_text(toml.dumps({
-            "paths": {
-                "content_repo": str(tmp_path / "content"),
-                "images_dir": "images"
-            },
-            "story": {"current_story": "test"}
-        }))
-        
-        images_dir = tmp_path / "content" / "images"
-        images_dir.mkdir(parents=True)
-        
-        (images_dir / "image1.png").write_text("")
-        (images_dir / "image2.jpg").write_text("")
-        
-        search._config = toml.load(str(config_path))
-        search._content_repo_path = Path(search._config["paths"]["content_repo"])
-        search._images_dir_name = search._config["paths"]["images_dir"]
-        
-        result = search.find_images("*")
-        
-        assert len(result) == 2
+    touch_many(articles_dir, ["wizard-gandalf.md"])
+    
+    assert search.find_articles("wizard") == ["wizard-gandalf.md", "wizard-merlin.md"]
 
 
-class TestFindSongs:
-    """Test find_songs functionality."""
+def test_case_insensitive_search(configure_search):
+    """Should be case-insensitive."""
+    articles_dir = configure_search(articles="articles") / "articles"
+    articles_dir.mkdir(parents=True)
     
-    def test_finds_matching_songs(self, tmp_path):
-        """Should find songs matching search term."""
-        config_path = tmp_path / "config.toml"
-        config_path.write_text(toml.dumps({
-            "paths": {
-                "content_repo": str(tmp_path / "content"),
-                "songs_dir": "songs"
-            },
-            "story": {"current_story": "test"}
-        }))
-        
-        songs_dir = tmp_path / "content" / "songs"
-        songs_dir.mkdir(parents=True)
-        
-        (songs_dir / "epic-battle.mp3").write_text("")
-        (songs_dir / "battle-cry.wav").write_text("")
-        (songs_dir / "peaceful-melody.ogg").write_text("")
-        
-        search._config = toml.load(str(config_path))
-        search._content_repo_path = Path(search._config["paths"]["content_repo"])
-        search._songs_dir_name = search._config["paths"]["songs_dir"]
-        
-        result = search.find_songs("battle")
-        
-        assert len(result) == 2
-        assert "epic-battle.mp3" in result
-        assert "battle-cry.wav" in result
+    (articles_dir / "London.md").write_text("# London\n")
+    
+    result = search.find_articles("london")
+    
+    assert len(result) == 1
+    assert "London.md" in result
 
 
 class TestFindFiles:
     """Test find_files convenience function."""
     
-    def test_finds_files_across_all_types(self, tmp_path):
+    def test_finds_files_across_all_types(self, configure_search):
         """Should find files across articles, images, and songs."""
-        config_path = tmp_path / "config.toml"
-        config_path.write_text(toml.dumps({
-            "paths": {
-                "content_repo": str(tmp_path / "content"),
-                "articles_dir": "articles",
-                "images_dir": "images",
-                "songs_dir": "songs"
-            },
-            "story": {"current_story": "test"}
-        }))
-        
-        content = tmp_path / "content"
+        content = configure_search(articles="articles", images="images", songs="songs")
         
         articles_dir = content / "articles"
         articles_dir.mkdir(parents=True)
@@ -210,63 +98,36 @@ class TestFindFiles:
         
         images_dir = content / "images"
         images_dir.mkdir(parents=True)
-        (images_dir / "wizard-hat.png").write_text("")
+        touch_many(images_dir, ["wizard-hat.png"])
         
         songs_dir = content / "songs"
         songs_dir.mkdir(parents=True)
-        (songs_dir / "wizard-song.mp3").write_text("")
-        
-        search._config = toml.load(str(config_path))
-        search._content_repo_path = Path(search._config["paths"]["content_repo"])
-        search._articles_dir_name = search._config["paths"]["articles_dir"]
-        search._images_dir_name = search._config["paths"]["images_dir"]
-        search._songs_dir_name = search._config["paths"]["songs_dir"]
+        touch_many(songs_dir, ["wizard-song.mp3"])
         
         result = search.find_files("wizard")
         
-        assert len(result) == 3
-        assert "wizard-lore.md" in result
-        assert "wizard-hat.png" in result
-        assert "wizard-song.mp3" in result
+        assert set(result) == {"wizard-lore.md", "wizard-hat.png", "wizard-song.mp3"}
     
-    def test_returns_sorted_list(self, tmp_path):
+    def test_returns_sorted_list(self, configure_search):
         """Should return sorted list of files."""
-        config_path = tmp_path / "config.toml"
-        config_path.write_text(toml.dumps({
-            "paths": {
-                "content_repo": str(tmp_path / "content"),
-                "articles_dir": "articles",
-                "images_dir": "images",
-                "songs_dir": "songs"
-            },
-            "story": {"current_story": "test"}
-        }))
-        
-        content = tmp_path / "content"
+        content = configure_search(articles="articles", images="images", songs="songs")
         
         articles_dir = content / "articles"
         articles_dir.mkdir(parents=True)
-        (articles_dir / "zebra.md").write_text("")
-        (articles_dir / "aardvark.md").write_text("")
+        touch_many(articles_dir, ["zebra.md", "aardvark.md"])
         
         images_dir = content / "images"
         images_dir.mkdir(parents=True)
-        (images_dir / "monkey.png").write_text("")
+        touch_many(images_dir, ["monkey.png"])
         
         songs_dir = content / "songs"
         songs_dir.mkdir(parents=True)
         
-        search._config = toml.load(str(config_path))
-        search._content_repo_path = Path(search._config["paths"]["content_repo"])
-        search._articles_dir_name = search._config["paths"]["articles_dir"]
-        search._images_dir_name = search._config["paths"]["images_dir"]
-        search._songs_dir_name = search._config["paths"]["songs_dir"]
-        
         result = search.find_files("*")
         
-        # Should be sorted alphabetically
-        assert result[0] == "aardvark.md"
-        assert result[-1] == "zebra.md"
+        # Should be exactly these files, sorted alphabetically
+        assert set(result) == {"zebra.md", "aardvark.md", "monkey.png"}
+        assert result == sorted(result)
 
 
 if __name__ == "__main__":